@@ -1,79 +1,476 @@
 import streamlit as st
 import pandas as pd
+import atexit
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 import hashlib
-import json
+import hmac
+import orjson
 import os
+import queue
+import secrets
+import sqlite3
+import string
+import threading
 import uuid
 import plotly.express as px
 import time
 from email_validator import validate_email, EmailNotValidError
-import re
 
 # Constants
-DATA_FILE = "bank_data.json"
-LOAN_INTEREST_RATE = 0.05  # 5% annual interest
-FIXED_DEPOSIT_INTEREST = 0.07  # 7% annual interest
+DB_FILE = "bank.db"
+LEGACY_DATA_FILE = "bank_data.json"  # pre-SQLite data, imported once if present
+LOAN_INTEREST_RATE_BPS = 500  # 5% annual interest, in basis points
+FIXED_DEPOSIT_INTEREST_BPS = 700  # 7% annual interest, in basis points
 MIN_PASSWORD_LENGTH = 8
 SESSION_TIMEOUT = 1800  # 30 minutes in seconds
+TS_FMT = "%Y-%m-%d %H:%M:%S"
+LOCKOUT_SECONDS = 3600  # 1 hour lock after too many failed logins
+HISTORY_PAGE_SIZE = 25  # transactions shown per page in the history view
+
+# Card markup is compiled once as templates; the per-item loops only
+# substitute values instead of rebuilding ~1KB f-strings every rerun
+LOAN_CARD_TMPL = string.Template("""
+    <div class="loan-card">
+        <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 1rem;">
+            <div>
+                <span class="loan-status ${status_class}">${status}</span>
+            </div>
+            <div style="font-size: 1.2rem; font-weight: bold;">$$${remaining_balance}</div>
+        </div>
+        <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 1rem; margin-bottom: 1rem;">
+            <div>
+                <div style="font-size: 0.8rem; color: #7f8c8d;">Original Amount</div>
+                <div style="font-weight: 500;">$$${amount}</div>
+            </div>
+            <div>
+                <div style="font-size: 0.8rem; color: #7f8c8d;">Duration</div>
+                <div style="font-weight: 500;">${duration_months} months</div>
+            </div>
+            <div>
+                <div style="font-size: 0.8rem; color: #7f8c8d;">Interest Rate</div>
+                <div style="font-weight: 500;">${interest_rate}%</div>
+            </div>
+            <div>
+                <div style="font-size: 0.8rem; color: #7f8c8d;">Monthly Payment</div>
+                <div style="font-weight: 500;">$$${monthly_payment}</div>
+            </div>
+        </div>
+        <div style="margin-bottom: 1rem;">
+            <div style="display: flex; justify-content: space-between; font-size: 0.8rem;">
+                <div>Progress</div>
+                <div>${payments_made}/${duration_months} payments</div>
+            </div>
+            <div class="progress-container">
+                <div class="progress-bar" style="width: ${progress_pct}%"></div>
+            </div>
+        </div>
+""")
+
+FD_CARD_TMPL = string.Template("""
+    <div class="fd-card">
+        <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 1rem; margin-bottom: 1rem;">
+            <div>
+                <div style="font-size: 0.8rem; color: #7f8c8d;">Principal</div>
+                <div style="font-weight: 500;">$$${principal}</div>
+            </div>
+            <div>
+                <div style="font-size: 0.8rem; color: #7f8c8d;">Duration</div>
+                <div style="font-weight: 500;">${duration_months} months</div>
+            </div>
+            <div>
+                <div style="font-size: 0.8rem; color: #7f8c8d;">Interest Rate</div>
+                <div style="font-weight: 500;">${interest_rate}%</div>
+            </div>
+            <div>
+                <div style="font-size: 0.8rem; color: #7f8c8d;">Maturity Amount</div>
+                <div style="font-weight: 500;">$$${maturity_amount}</div>
+            </div>
+        </div>
+        <div style="margin-bottom: 1rem;">
+            <div style="font-size: 0.8rem; color: #7f8c8d;">Start Date</div>
+            <div style="font-weight: 500;">${start_date}</div>
+        </div>
+        <div style="margin-bottom: 1rem;">
+            <div style="font-size: 0.8rem; color: #7f8c8d;">Maturity Date</div>
+            <div style="font-weight: 500;">${maturity_date}</div>
+        </div>
+""")
+
+FD_DAYS_REMAINING_TMPL = string.Template("""
+    <div style="margin-top: 1rem;">
+        <div style="font-size: 0.8rem; color: #7f8c8d;">Days to Maturity</div>
+        <div style="font-weight: 500;">${days_remaining} days</div>
+    </div>
+""")
 
 # Initialize session state
+_DEFAULTS = {
+    'authenticated': False,
+    'current_user': None,
+    'accounts': {},
+    'transactions': {},
+    'transfer_data': {},
+    'loans': {},
+    'fixed_deposits': {},
+    'session_expiry': None,
+    'failed_attempts': {},
+    'email_index': {},
+    'transactions_version': 0
+}
+
 def init_session_state():
-    if 'authenticated' not in st.session_state:
-        st.session_state.authenticated = False
-    if 'current_user' not in st.session_state:
-        st.session_state.current_user = None
-    if 'accounts' not in st.session_state:
-        st.session_state.accounts = {}
-    if 'transactions' not in st.session_state:
-        st.session_state.transactions = {}
-    if 'transfer_data' not in st.session_state:
-        st.session_state.transfer_data = {}
-    if 'loans' not in st.session_state:
-        st.session_state.loans = {}
-    if 'fixed_deposits' not in st.session_state:
-        st.session_state.fixed_deposits = {}
-    if 'login_time' not in st.session_state:
-        st.session_state.login_time = None
-    if 'failed_attempts' not in st.session_state:
-        st.session_state.failed_attempts = {}
+    if st.session_state.get('_initialized'):
+        return
+    for key, value in _DEFAULTS.items():
+        st.session_state.setdefault(key, {} if isinstance(value, dict) else value)
+    # st.cache_data is process-global; the nonce keeps one session's
+    # cached frames from being served to another
+    st.session_state.session_nonce = uuid.uuid4().hex
+    st.session_state._initialized = True
+
+def tx_cache_key():
+    return (st.session_state.session_nonce, st.session_state.transactions_version)
 
 # Data persistence functions
+@st.cache_resource
+def get_conn():
+    # One connection per server process, shared across sessions/reruns
+    conn = sqlite3.connect(DB_FILE, isolation_level=None, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    init_db(conn)
+    return conn
+
+def init_db(conn):
+    conn.execute("""CREATE TABLE IF NOT EXISTS accounts (
+        username TEXT PRIMARY KEY,
+        password TEXT,
+        salt TEXT,
+        balance INTEGER,
+        email TEXT,
+        account_id TEXT,
+        created TEXT,
+        last_login TEXT,
+        account_type TEXT,
+        status TEXT
+    )""")
+    ensure_column(conn, 'accounts', 'salt', 'TEXT')
+    ensure_column(conn, 'accounts', 'created_ts', 'INTEGER')
+    ensure_column(conn, 'accounts', 'active_loan_id', 'TEXT')
+    conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_accounts_email ON accounts(lower(email))")
+    migrate_transactions_table(conn)
+    conn.execute("""CREATE TABLE IF NOT EXISTS transactions (
+        tx_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        username TEXT,
+        type TEXT,
+        amount INTEGER,
+        ts TEXT,
+        balance_after INTEGER,
+        description TEXT
+    )""")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_tx_username ON transactions(username)")
+    conn.execute("""CREATE TABLE IF NOT EXISTS loans (
+        loan_id TEXT PRIMARY KEY,
+        username TEXT,
+        data TEXT
+    )""")
+    conn.execute("""CREATE TABLE IF NOT EXISTS fixed_deposits (
+        fd_id TEXT PRIMARY KEY,
+        username TEXT,
+        data TEXT
+    )""")
+    conn.execute("""CREATE TABLE IF NOT EXISTS failed_attempts (
+        username TEXT PRIMARY KEY,
+        count INTEGER,
+        timestamp TEXT,
+        ts INTEGER
+    )""")
+    ensure_column(conn, 'failed_attempts', 'ts', 'INTEGER')
+    migrate_legacy_json(conn)
+
+def migrate_transactions_table(conn):
+    # Databases from before the integer-id change keyed transactions by a
+    # TEXT uuid; rebuild with an autoincrement id, keeping row order by time
+    columns = {row[1]: row[2] for row in conn.execute("PRAGMA table_info(transactions)")}
+    if not columns or columns.get('tx_id') == 'INTEGER':
+        return
+    conn.execute("ALTER TABLE transactions RENAME TO transactions_old")
+    conn.execute("""CREATE TABLE transactions (
+        tx_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        username TEXT,
+        type TEXT,
+        amount INTEGER,
+        ts TEXT,
+        balance_after INTEGER,
+        description TEXT
+    )""")
+    conn.execute(
+        "INSERT INTO transactions (username, type, amount, ts, balance_after, description) "
+        "SELECT username, type, amount, ts, balance_after, description FROM transactions_old ORDER BY ts")
+    conn.execute("DROP TABLE transactions_old")
+
+def ensure_column(conn, table, column, decl):
+    # Lightweight migration for databases created before the column existed
+    columns = [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+    if column not in columns:
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {decl}")
+
+def migrate_legacy_json(conn):
+    # One-time import of the old full-file JSON store into SQLite
+    if not os.path.exists(LEGACY_DATA_FILE):
+        return
+    if conn.execute("SELECT 1 FROM accounts LIMIT 1").fetchone():
+        return
+    with open(LEGACY_DATA_FILE, 'rb') as f:
+        data = orjson.loads(f.read())
+    seen_emails = set()
+    for username, account in data.get('accounts', {}).items():
+        email = account.get('email')
+        if email:
+            # The JSON-era email check was case-sensitive, so old stores
+            # can hold case variants of one address; the unique index on
+            # lower(email) would reject the second. Keep the account and
+            # drop its clashing email rather than fail the whole import.
+            if email.lower() in seen_emails:
+                email = None
+            else:
+                seen_emails.add(email.lower())
+        conn.execute(
+            "INSERT OR REPLACE INTO accounts (username, password, salt, balance, email, account_id, created, last_login, account_type, status) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (username, account.get('password'), account.get('salt'),
+             account.get('balance', 0), email,
+             account.get('account_id'), account.get('created'),
+             account.get('last_login'), account.get('account_type', 'standard'),
+             account.get('status', 'active')))
+    for username, user_txs in data.get('transactions', {}).items():
+        for tx in user_txs.values():
+            conn.execute(
+                "INSERT INTO transactions (username, type, amount, ts, balance_after, description) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (username, tx.get('type'), tx.get('amount', 0),
+                 tx.get('timestamp'), tx.get('balance_after'), tx.get('description')))
+    for username, user_loans in data.get('loans', {}).items():
+        for loan_id, loan in user_loans.items():
+            conn.execute("INSERT OR REPLACE INTO loans VALUES (?, ?, ?)",
+                         (loan_id, username, orjson.dumps(loan).decode()))
+    for username, user_fds in data.get('fixed_deposits', {}).items():
+        for fd_id, fd in user_fds.items():
+            conn.execute("INSERT OR REPLACE INTO fixed_deposits VALUES (?, ?, ?)",
+                         (fd_id, username, orjson.dumps(fd).decode()))
+    for username, attempt in data.get('failed_attempts', {}).items():
+        conn.execute("INSERT OR REPLACE INTO failed_attempts VALUES (?, ?, ?, ?)",
+                     (username, attempt.get('count', 0), attempt.get('timestamp'),
+                      attempt.get('ts')))
+
 def load_data():
-    if os.path.exists(DATA_FILE):
-        with open(DATA_FILE, 'r') as f:
-            data = json.load(f)
-            st.session_state.accounts = data.get('accounts', {})
-            st.session_state.transactions = data.get('transactions', {})
-            st.session_state.loans = data.get('loans', {})
-            st.session_state.fixed_deposits = data.get('fixed_deposits', {})
-            st.session_state.failed_attempts = data.get('failed_attempts', {})
-
-def save_data():
-    data = {
-        'accounts': st.session_state.accounts,
-        'transactions': st.session_state.transactions,
-        'loans': st.session_state.loans,
-        'fixed_deposits': st.session_state.fixed_deposits,
-        'failed_attempts': st.session_state.failed_attempts
-    }
-    with open(DATA_FILE, 'w') as f:
-        json.dump(data, f)
+    conn = get_conn()
+    accounts = {}
+    for row in conn.execute("SELECT username, password, salt, balance, email, account_id, created, created_ts, last_login, account_type, status, active_loan_id FROM accounts"):
+        account = {
+            'password': row[1],
+            'salt': row[2],
+            'balance': row[3],
+            'email': row[4],
+            'account_id': row[5],
+            'created': row[6],
+            'created_ts': row[7],
+            'last_login': row[8],
+            'account_type': row[9],
+            'status': row[10],
+            'active_loan_id': row[11]
+        }
+        # Rows from before the epoch column get parsed once here, not on
+        # every age check
+        if account['created_ts'] is None and account['created']:
+            account['created_ts'] = int(datetime.strptime(account['created'], TS_FMT).timestamp())
+        accounts[row[0]] = account
+    transactions = {}
+    for row in conn.execute("SELECT tx_id, username, type, amount, ts, balance_after, description FROM transactions"):
+        user_txs = transactions.setdefault(row[1], new_tx_columns())
+        user_txs['id'].append(row[0])
+        user_txs['type'].append(row[2])
+        user_txs['amount'].append(row[3])
+        user_txs['timestamp'].append(row[4])
+        user_txs['balance_after'].append(row[5])
+        user_txs['description'].append(row[6])
+    loans = {}
+    for row in conn.execute("SELECT username, loan_id, data FROM loans"):
+        loan = orjson.loads(row[2])
+        if 'progress_pct' not in loan:
+            loan['progress_pct'] = int(loan['payments_made'] / loan['duration_months'] * 100)
+        loans.setdefault(row[0], {})[row[1]] = loan
+    # Backfill active_loan_id for accounts saved before the column existed
+    for username, user_loans in loans.items():
+        account = accounts.get(username)
+        if account is not None and not account.get('active_loan_id'):
+            for loan_id, loan in user_loans.items():
+                if loan['status'] == 'active':
+                    account['active_loan_id'] = loan_id
+                    break
+    fixed_deposits = {}
+    for row in conn.execute("SELECT username, fd_id, data FROM fixed_deposits"):
+        fd = orjson.loads(row[2])
+        # FDs saved before the epoch column get parsed once here, not on
+        # every maturity check
+        if 'maturity_ts' not in fd:
+            fd['maturity_ts'] = int(datetime.strptime(fd['maturity_date'], TS_FMT).timestamp())
+        fixed_deposits.setdefault(row[0], {})[row[1]] = fd
+    failed_attempts = {}
+    for row in conn.execute("SELECT username, count, timestamp, ts FROM failed_attempts"):
+        attempt = {'count': row[1], 'timestamp': row[2], 'ts': row[3]}
+        if attempt['ts'] is None and attempt['timestamp']:
+            attempt['ts'] = int(datetime.strptime(attempt['timestamp'], TS_FMT).timestamp())
+        failed_attempts[row[0]] = attempt
+    st.session_state.update({
+        'accounts': accounts,
+        'email_index': {
+            account['email'].lower(): username
+            for username, account in accounts.items() if account.get('email')
+        },
+        'transactions': transactions,
+        'loans': loans,
+        'fixed_deposits': fixed_deposits,
+        'failed_attempts': failed_attempts
+    })
+
+# Row-level write helpers: each persists only the record that changed
+def save_account(username):
+    account = st.session_state.accounts[username]
+    get_conn().execute(
+        "INSERT OR REPLACE INTO accounts (username, password, salt, balance, email, account_id, created, created_ts, last_login, account_type, status, active_loan_id) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (username, account['password'], account.get('salt'), account['balance'],
+         account['email'], account['account_id'], account['created'],
+         account.get('created_ts'), account['last_login'],
+         account['account_type'], account['status'], account.get('active_loan_id')))
+
+def save_login_bookkeeping(username):
+    # Only the login-touched columns go through the deferred writer: a
+    # full-row snapshot flushed later would overwrite balance changes
+    # committed synchronously in the meantime
+    account = st.session_state.accounts[username]
+    exec_async(
+        "UPDATE accounts SET last_login = ?, password = ?, salt = ? WHERE username = ?",
+        (account['last_login'], account['password'], account.get('salt'), username))
+
+def save_balance(username):
+    get_conn().execute("UPDATE accounts SET balance = ? WHERE username = ?",
+                       (st.session_state.accounts[username]['balance'], username))
+
+def record_json(record):
+    # Underscore keys are derived caches (e.g. _html_cache) and stay out
+    # of the persisted blob
+    return orjson.dumps({k: v for k, v in record.items() if not k.startswith('_')}).decode()
+
+def save_loan(username, loan_id):
+    get_conn().execute("INSERT OR REPLACE INTO loans VALUES (?, ?, ?)",
+                       (loan_id, username, record_json(st.session_state.loans[username][loan_id])))
+
+def save_fixed_deposit(username, fd_id):
+    get_conn().execute("INSERT OR REPLACE INTO fixed_deposits VALUES (?, ?, ?)",
+                       (fd_id, username, record_json(st.session_state.fixed_deposits[username][fd_id])))
+
+def save_failed_attempts(username):
+    attempt = st.session_state.failed_attempts[username]
+    # Fire-and-forget: lockout state lives in session anyway
+    exec_async("INSERT OR REPLACE INTO failed_attempts VALUES (?, ?, ?, ?)",
+               (username, attempt['count'], attempt['timestamp'], attempt.get('ts')))
+
+def clear_failed_attempts(username):
+    exec_async("DELETE FROM failed_attempts WHERE username = ?", (username,))
+
+@contextmanager
+def db_transaction():
+    # Groups several row writes into one atomic commit (one fsync instead
+    # of one per statement); rolls everything back if any step fails.
+    # The lock keeps the background writer from interleaving its own
+    # transaction on the shared connection.
+    conn = get_conn()
+    with _db_lock:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+# Background writer for non-financial state (login bookkeeping). Balance
+# mutations always commit synchronously before the handler returns.
+_db_lock = threading.Lock()
+_write_queue = queue.Queue()
+_writer_started = False
+
+def _writer_loop():
+    while True:
+        first = _write_queue.get()
+        # Let a burst of writes accumulate, then commit them together
+        time.sleep(0.05)
+        batch = [first]
+        while True:
+            try:
+                batch.append(_write_queue.get_nowait())
+            except queue.Empty:
+                break
+        conn = get_conn()
+        with _db_lock:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for sql, params in batch:
+                    conn.execute(sql, params)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+        for _ in batch:
+            _write_queue.task_done()
+
+def exec_async(sql, params):
+    global _writer_started
+    if not _writer_started:
+        threading.Thread(target=_writer_loop, daemon=True).start()
+        atexit.register(_write_queue.join)
+        _writer_started = True
+    _write_queue.put((sql, params))
 
 # Security functions
-def hash_password(password):
-    return hashlib.sha256(password.encode()).hexdigest()
+def hash_password(password, salt):
+    return hashlib.scrypt(password.encode(), salt=bytes.fromhex(salt),
+                          n=2**14, r=8, p=1, dklen=32).hex()
+
+def verify_password(account, password):
+    salt = account.get('salt')
+    if salt:
+        return hmac.compare_digest(account['password'], hash_password(password, salt))
+    # Accounts created before the scrypt upgrade hold a plain SHA-256 hash
+    return hmac.compare_digest(account['password'],
+                               hashlib.sha256(password.encode()).hexdigest())
+
+SPECIAL_CHARS = set("!@#$%^&*(),.?\":{}|<>")
 
 def check_password_strength(password):
     if len(password) < MIN_PASSWORD_LENGTH:
         return False, "Password must be at least 8 characters long"
-    if not re.search(r"[A-Z]", password):
+    # Single pass over the password instead of one regex scan per rule
+    has_upper = has_lower = has_digit = has_special = False
+    for char in password:
+        if char.isupper():
+            has_upper = True
+        elif char.islower():
+            has_lower = True
+        elif char.isdigit():
+            has_digit = True
+        elif char in SPECIAL_CHARS:
+            has_special = True
+    if not has_upper:
         return False, "Password must contain at least one uppercase letter"
-    if not re.search(r"[a-z]", password):
+    if not has_lower:
         return False, "Password must contain at least one lowercase letter"
-    if not re.search(r"[0-9]", password):
+    if not has_digit:
         return False, "Password must contain at least one digit"
-    if not re.search(r"[!@#$%^&*(),.?\":{}|<>]", password):
+    if not has_special:
         return False, "Password must contain at least one special character"
     return True, "Password is strong"
 
@@ -85,112 +482,186 @@ def validate_email_address(email):
         return False, str(e)
 
 def check_session_timeout():
-    if st.session_state.login_time and st.session_state.authenticated:
-        elapsed = time.time() - st.session_state.login_time
-        if elapsed > SESSION_TIMEOUT:
-            st.session_state.authenticated = False
-            st.session_state.current_user = None
-            st.warning("Session timed out due to inactivity. Please login again.")
-            return True
+    # Compare against an absolute deadline; logout clears it, so no
+    # separate authenticated check is needed
+    expiry = st.session_state.session_expiry
+    if expiry and time.time() > expiry:
+        st.session_state.authenticated = False
+        st.session_state.current_user = None
+        st.session_state.session_expiry = None
+        st.warning("Session timed out due to inactivity. Please login again.")
+        return True
     return False
 
 # Account management
 def create_account(username, password, email, initial_deposit=0):
+    initial_deposit = int(initial_deposit)
     if username in st.session_state.accounts:
         return False, "Username already exists"
 
-    # Check if email is already registered
-    for user, data in st.session_state.accounts.items():
-        if 'email' in data and data['email'] == email:
-            return False, "Email already registered with another account"
+    # Check if email is already registered (case-insensitive O(1) lookup)
+    if email.lower() in st.session_state.email_index:
+        return False, "Email already registered with another account"
 
-    hashed_pw = hash_password(password)
-    account_id = str(uuid.uuid4())[:8]  # Generate unique account ID
+    salt = os.urandom(16).hex()
+    hashed_pw = hash_password(password, salt)
+    account_id = secrets.token_hex(4)  # 8-char unique account ID
 
     st.session_state.accounts[username] = {
         'password': hashed_pw,
-        'balance': int(initial_deposit),
-        'created': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        'salt': salt,
+        'balance': initial_deposit,
+        'created': datetime.now().strftime(TS_FMT),
+        'created_ts': int(time.time()),
         'account_id': account_id,
         'email': email,
         'last_login': None,
         'account_type': 'standard',
-        'status': 'active'
+        'status': 'active',
+        'active_loan_id': None
     }
 
-    if initial_deposit > 0:
-        transaction_id = str(uuid.uuid4())
-        record_transaction(username, 'Account Creation Deposit', initial_deposit, transaction_id)
+    st.session_state.email_index[email.lower()] = username
 
-    save_data()
+    # Account row and opening deposit land in one commit
+    with db_transaction():
+        save_account(username)
+        if initial_deposit > 0:
+            record_transaction(username, 'Account Creation Deposit', initial_deposit)
     return True, f"Account created successfully! Your Account ID: {account_id}"
 
 def authenticate(username, password):
     # Check if account is locked
     if username in st.session_state.failed_attempts:
-        if st.session_state.failed_attempts[username]['count'] >= 5:
-            last_attempt = st.session_state.failed_attempts[username]['timestamp']
-            if (datetime.now() - datetime.strptime(last_attempt, "%Y-%m-%d %H:%M:%S")).seconds < 3600:  # 1 hour lock
-                return False, "Account locked due to too many failed attempts. Try again later."
+        attempt = st.session_state.failed_attempts[username]
+        if attempt['count'] >= 5 and time.time() - attempt['ts'] < LOCKOUT_SECONDS:
+            return False, "Account locked due to too many failed attempts. Try again later."
 
+    # Unknown usernames return before any KDF work is done
     if username not in st.session_state.accounts:
         return False, "Username not found"
 
-    hashed_pw = hash_password(password)
-    if st.session_state.accounts[username]['password'] != hashed_pw:
+    account = st.session_state.accounts[username]
+    if not verify_password(account, password):
         # Record failed attempt
         if username not in st.session_state.failed_attempts:
-            st.session_state.failed_attempts[username] = {'count': 0, 'timestamp': None}
+            st.session_state.failed_attempts[username] = {'count': 0, 'timestamp': None, 'ts': None}
         st.session_state.failed_attempts[username]['count'] += 1
-        st.session_state.failed_attempts[username]['timestamp'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        save_data()
+        st.session_state.failed_attempts[username]['timestamp'] = datetime.now().strftime(TS_FMT)
+        st.session_state.failed_attempts[username]['ts'] = int(time.time())
+        save_failed_attempts(username)
 
         remaining_attempts = 5 - st.session_state.failed_attempts[username]['count']
         if remaining_attempts <= 0:
             return False, "Account locked due to too many failed attempts. Try again later."
         return False, f"Incorrect password. {remaining_attempts} attempts remaining"
 
-    # Reset failed attempts on successful login
-    if username in st.session_state.failed_attempts:
-        del st.session_state.failed_attempts[username]
-        save_data()
+    # Upgrade legacy SHA-256 hashes to salted scrypt now that we hold the
+    # cleartext password
+    if not account.get('salt'):
+        account['salt'] = os.urandom(16).hex()
+        account['password'] = hash_password(password, account['salt'])
 
     st.session_state.authenticated = True
     st.session_state.current_user = username
-    st.session_state.login_time = time.time()
-    st.session_state.accounts[username]['last_login'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    save_data()
+    st.session_state.session_expiry = time.time() + SESSION_TIMEOUT
+    account['last_login'] = datetime.now().strftime(TS_FMT)
+
+    # Login bookkeeping doesn't need to block the response; the writer
+    # thread batches these into one commit
+    if username in st.session_state.failed_attempts:
+        del st.session_state.failed_attempts[username]
+        clear_failed_attempts(username)
+    save_login_bookkeeping(username)
     return True, "Login successful"
 
 # Transaction functions
-def record_transaction(username, transaction_type, amount, transaction_id=None, description=None):
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    if not transaction_id:
-        transaction_id = str(uuid.uuid4())
-
-    if username not in st.session_state.transactions:
-        st.session_state.transactions[username] = {}
-
-    st.session_state.transactions[username][transaction_id] = {
-        'type': transaction_type,
-        'amount': int(amount),
-        'timestamp': timestamp,
-        'balance_after': st.session_state.accounts[username]['balance'],
-        'transaction_id': transaction_id,
-        'description': description
-    }
-    save_data()
+def new_tx_columns():
+    # Transactions are held column-wise (one list per field) so the
+    # history DataFrame can be built without a per-row dict pass
+    return {'id': [], 'type': [], 'amount': [], 'timestamp': [],
+            'balance_after': [], 'description': []}
+
+def record_transaction(username, transaction_type, amount, description=None):
+    timestamp = datetime.now().strftime(TS_FMT)
+    balance_after = st.session_state.accounts[username]['balance']
+
+    # The autoincrement rowid is the transaction id - no uuid allocation
+    cursor = get_conn().execute(
+        "INSERT INTO transactions (username, type, amount, ts, balance_after, description) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        (username, transaction_type, amount, timestamp, balance_after, description))
+    transaction_id = cursor.lastrowid
+
+    user_txs = st.session_state.transactions.setdefault(username, new_tx_columns())
+    user_txs['id'].append(transaction_id)
+    user_txs['type'].append(transaction_type)
+    user_txs['amount'].append(amount)
+    user_txs['timestamp'].append(timestamp)
+    user_txs['balance_after'].append(balance_after)
+    user_txs['description'].append(description)
+    # Invalidates the cached history DataFrame for this session
+    st.session_state.transactions_version += 1
     return transaction_id
 
+@st.cache_data(max_entries=4)
+def all_transactions_df(cache_key):
+    # One canonical frame over every user's column buffers, indexed and
+    # sorted by username so per-user access is an index slice, not a scan
+    frames = []
+    for username, user_txs in st.session_state.transactions.items():
+        if not user_txs['id']:
+            continue
+        user_df = pd.DataFrame(user_txs)
+        user_df['username'] = username
+        frames.append(user_df)
+    if not frames:
+        return pd.DataFrame()
+    df = pd.concat(frames, ignore_index=True)
+    # Explicit format keeps the parse on pandas' C fast path instead of
+    # per-value inference
+    df['timestamp_dt'] = pd.to_datetime(df['timestamp'], format=TS_FMT, cache=True)
+    df['type'] = df['type'].astype('category')
+    # No sort: the per-user buffers append chronologically and concat
+    # keeps each user's rows contiguous
+    return df.set_index('username')
+
+@st.cache_data(max_entries=32)
+def user_transactions_df(username, cache_key):
+    # cache_key is tx_cache_key(): session nonce plus the version bumped
+    # by record_transaction; on a hit the DataFrame (timestamps already
+    # parsed, newest first) is reused
+    df = all_transactions_df(cache_key)
+    if df.empty or username not in df.index:
+        return pd.DataFrame()
+    # Newest first is just the reversed insertion order - a view, not a
+    # sort
+    return df.loc[[username]].iloc[::-1].reset_index(drop=True)
+
+@st.cache_data(max_entries=32)
+def build_trend_fig(username, cache_key, transaction_type, date_range, _df):
+    # Keyed on the filter state; _df (already filtered) is excluded from
+    # hashing so reruns with unchanged filters skip figure assembly
+    df_chart = _df.copy()
+    df_chart['date'] = df_chart['timestamp_dt'].dt.date
+    # observed=True: without it the categorical 'type' adds flat zero
+    # traces for transaction types this user never had
+    df_chart = df_chart.groupby(['date', 'type'], observed=True)['amount'].sum().unstack().fillna(0)
+    return px.line(df_chart, title="Daily Transaction Amounts")
+
 def deposit(username, amount):
+    amount = int(amount)
     if amount <= 0:
         return False, "Amount must be positive"
 
-    st.session_state.accounts[username]['balance'] += amount
-    transaction_id = record_transaction(username, 'Deposit', amount)
+    with db_transaction():
+        st.session_state.accounts[username]['balance'] += amount
+        save_balance(username)
+        transaction_id = record_transaction(username, 'Deposit', amount)
     return True, f"Deposited ${amount} successfully. Transaction ID: {transaction_id}"
 
 def withdraw(username, amount):
+    amount = int(amount)
     if amount <= 0:
         return False, "Amount must be positive"
 
@@ -198,11 +669,15 @@ def withdraw(username, amount):
     if amount > current_balance:
         return False, "Insufficient funds"
 
-    st.session_state.accounts[username]['balance'] -= amount
-    transaction_id = record_transaction(username, 'Withdrawal', amount)
+    with db_transaction():
+        st.session_state.accounts[username]['balance'] -= amount
+        save_balance(username)
+        transaction_id = record_transaction(username, 'Withdrawal', amount)
     return True, f"Withdrew ${amount} successfully. Transaction ID: {transaction_id}"
 
 def initiate_transfer(sender_username, recipient_username, recipient_account_id, amount, description=None):
+    amount = int(amount)
+
     # Check if recipient exists
     if recipient_username not in st.session_state.accounts:
         return False, "Recipient username not found"
@@ -226,7 +701,7 @@ def initiate_transfer(sender_username, recipient_username, recipient_account_id,
         'recipient': recipient_username,
         'recipient_account_id': recipient_account_id,
         'amount': amount,
-        'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        'timestamp': datetime.now().strftime(TS_FMT),
         'description': description
     }
 
@@ -242,14 +717,16 @@ def confirm_transfer(transfer_id):
     amount = transfer_details['amount']
     description = transfer_details.get('description', None)
 
-    # Perform the transfer
-    st.session_state.accounts[sender]['balance'] -= amount
-    st.session_state.accounts[recipient]['balance'] += amount
+    # Perform the transfer atomically: both balances and both log entries
+    # commit together or not at all
+    with db_transaction():
+        st.session_state.accounts[sender]['balance'] -= amount
+        st.session_state.accounts[recipient]['balance'] += amount
+        save_balance(sender)
+        save_balance(recipient)
 
-    # Record transactions
-    transaction_id = str(uuid.uuid4())
-    record_transaction(sender, 'Transfer Out', amount, transaction_id, description)
-    record_transaction(recipient, 'Transfer In', amount, transaction_id, description)
+        transaction_id = record_transaction(sender, 'Transfer Out', amount, description)
+        record_transaction(recipient, 'Transfer In', amount, description)
 
     # Clear the transfer data
     del st.session_state.transfer_data[transfer_id]
@@ -258,21 +735,20 @@ def confirm_transfer(transfer_id):
 
 # Loan functions
 def apply_for_loan(username, amount, duration_months):
+    amount = int(amount)
     if amount <= 0:
         return False, "Loan amount must be positive"
     if duration_months <= 0:
         return False, "Loan duration must be positive"
 
     # Simple credit check - at least 3 months of account history
-    account_created = datetime.strptime(st.session_state.accounts[username]['created'], "%Y-%m-%d %H:%M:%S")
-    if (datetime.now() - account_created).days < 90:
+    if time.time() - st.session_state.accounts[username]['created_ts'] < 90 * 86400:
         return False, "Account must be at least 3 months old to apply for a loan"
 
-    # Check if user already has an active loan
-    if username in st.session_state.loans:
-        for loan_id, loan in st.session_state.loans[username].items():
-            if loan['status'] == 'active':
-                return False, "You already have an active loan"
+    # Check if user already has an active loan (tracked on the account,
+    # no scan over loan history)
+    if st.session_state.accounts[username].get('active_loan_id'):
+        return False, "You already have an active loan"
 
     loan_id = str(uuid.uuid4())
     monthly_payment = calculate_monthly_payment(amount, duration_months)
@@ -283,26 +759,49 @@ def apply_for_loan(username, amount, duration_months):
     st.session_state.loans[username][loan_id] = {
         'amount': amount,
         'duration_months': duration_months,
-        'interest_rate': LOAN_INTEREST_RATE,
+        'interest_rate': LOAN_INTEREST_RATE_BPS / 10000,  # kept for display
         'monthly_payment': monthly_payment,
-        'remaining_balance': amount * (1 + LOAN_INTEREST_RATE),
-        'start_date': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        'remaining_balance': amount * (10000 + LOAN_INTEREST_RATE_BPS) // 10000,
+        'start_date': datetime.now().strftime(TS_FMT),
         'status': 'active',
-        'payments_made': 0
+        'payments_made': 0,
+        'progress_pct': 0
     }
+    loan = st.session_state.loans[username][loan_id]
+    loan['_html_cache'] = loan_card_html(loan)
 
     # Disburse loan amount to account
-    st.session_state.accounts[username]['balance'] += amount
-    record_transaction(username, 'Loan Disbursement', amount, description=f"Loan ID: {loan_id}")
-
-    save_data()
+    with db_transaction():
+        st.session_state.accounts[username]['balance'] += amount
+        st.session_state.accounts[username]['active_loan_id'] = loan_id
+        save_account(username)
+        record_transaction(username, 'Loan Disbursement', amount, description=f"Loan ID: {loan_id}")
+        save_loan(username, loan_id)
     return True, f"Loan approved! ${amount} has been deposited to your account. Loan ID: {loan_id}"
 
+def loan_card_html(loan):
+    # Rebuilt only on writes (and lazily for records loaded from disk);
+    # reruns emit the cached string
+    status_class = "status-active" if loan['status'] == 'active' else "status-paid"
+    return LOAN_CARD_TMPL.substitute(
+        status_class=status_class,
+        status=loan['status'].title(),
+        remaining_balance=f"{loan['remaining_balance']:,.2f}",
+        amount=f"{loan['amount']:,.2f}",
+        duration_months=loan['duration_months'],
+        interest_rate=loan['interest_rate'] * 100,
+        monthly_payment=f"{loan['monthly_payment']:,.2f}",
+        payments_made=loan['payments_made'],
+        progress_pct=loan['progress_pct'],
+    )
+
 def calculate_monthly_payment(principal, months):
-    total_amount = principal * (1 + LOAN_INTEREST_RATE)
-    return round(total_amount / months)
+    # Pure integer arithmetic: no float rounding in financial amounts
+    total_amount = principal * (10000 + LOAN_INTEREST_RATE_BPS) // 10000
+    return total_amount // months
 
 def make_loan_payment(username, loan_id, amount):
+    amount = int(amount)
     if username not in st.session_state.loans or loan_id not in st.session_state.loans[username]:
         return False, "Loan not found"
 
@@ -320,23 +819,30 @@ def make_loan_payment(username, loan_id, amount):
         return False, f"Minimum payment required: ${loan['monthly_payment']}"
 
     # Process payment
-    st.session_state.accounts[username]['balance'] -= amount
-    loan['remaining_balance'] -= amount
-    loan['payments_made'] += 1
-
-    # Record transaction
-    record_transaction(username, 'Loan Payment', amount, description=f"Loan ID: {loan_id}")
-
-    # Check if loan is fully paid
-    if loan['remaining_balance'] <= 0:
-        loan['status'] = 'paid'
-        loan['end_date'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-    save_data()
+    with db_transaction():
+        st.session_state.accounts[username]['balance'] -= amount
+        save_balance(username)
+        loan['remaining_balance'] -= amount
+        loan['payments_made'] += 1
+        loan['progress_pct'] = int(loan['payments_made'] / loan['duration_months'] * 100)
+
+        # Record transaction
+        record_transaction(username, 'Loan Payment', amount, description=f"Loan ID: {loan_id}")
+
+        # Check if loan is fully paid
+        if loan['remaining_balance'] <= 0:
+            loan['status'] = 'paid'
+            loan['end_date'] = datetime.now().strftime(TS_FMT)
+            st.session_state.accounts[username]['active_loan_id'] = None
+            save_account(username)
+
+        loan['_html_cache'] = loan_card_html(loan)
+        save_loan(username, loan_id)
     return True, f"Payment of ${amount} applied to loan {loan_id}"
 
 # Fixed Deposit functions
 def create_fixed_deposit(username, amount, duration_months):
+    amount = int(amount)
     if amount <= 0:
         return False, "Amount must be positive"
     if duration_months <= 0:
@@ -347,6 +853,8 @@ def create_fixed_deposit(username, amount, duration_months):
 
     fd_id = str(uuid.uuid4())
     maturity_amount = calculate_maturity_amount(amount, duration_months)
+    now = datetime.now()
+    maturity = now + timedelta(days=30*duration_months)
 
     if username not in st.session_state.fixed_deposits:
         st.session_state.fixed_deposits[username] = {}
@@ -354,22 +862,37 @@ def create_fixed_deposit(username, amount, duration_months):
     st.session_state.fixed_deposits[username][fd_id] = {
         'principal': amount,
         'duration_months': duration_months,
-        'interest_rate': FIXED_DEPOSIT_INTEREST,
+        'interest_rate': FIXED_DEPOSIT_INTEREST_BPS / 10000,  # kept for display
         'maturity_amount': maturity_amount,
-        'start_date': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        'maturity_date': (datetime.now() + timedelta(days=30*duration_months)).strftime("%Y-%m-%d %H:%M:%S"),
+        'start_date': now.strftime(TS_FMT),
+        'maturity_date': maturity.strftime(TS_FMT),  # display only
+        'maturity_ts': int(maturity.timestamp()),
         'status': 'active'
     }
+    fd = st.session_state.fixed_deposits[username][fd_id]
+    fd['_html_cache'] = fd_card_html(fd)
 
     # Deduct from account balance
-    st.session_state.accounts[username]['balance'] -= amount
-    record_transaction(username, 'Fixed Deposit Creation', amount, description=f"FD ID: {fd_id}")
-
-    save_data()
+    with db_transaction():
+        st.session_state.accounts[username]['balance'] -= amount
+        save_balance(username)
+        record_transaction(username, 'Fixed Deposit Creation', amount, description=f"FD ID: {fd_id}")
+        save_fixed_deposit(username, fd_id)
     return True, f"Fixed deposit created successfully! FD ID: {fd_id}"
 
+def fd_card_html(fd):
+    return FD_CARD_TMPL.substitute(
+        principal=f"{fd['principal']:,.2f}",
+        duration_months=fd['duration_months'],
+        interest_rate=fd['interest_rate'] * 100,
+        maturity_amount=f"{fd['maturity_amount']:,.2f}",
+        start_date=fd['start_date'],
+        maturity_date=fd['maturity_date'],
+    )
+
 def calculate_maturity_amount(principal, months):
-    return round(principal * (1 + FIXED_DEPOSIT_INTEREST * (months/12)))
+    effective_bps = FIXED_DEPOSIT_INTEREST_BPS * months // 12
+    return principal * (10000 + effective_bps) // 10000
 
 def close_fixed_deposit(username, fd_id):
     if username not in st.session_state.fixed_deposits or fd_id not in st.session_state.fixed_deposits[username]:
@@ -380,97 +903,32 @@ def close_fixed_deposit(username, fd_id):
         return False, "Fixed deposit is not active"
 
     # Check if matured
-    maturity_date = datetime.strptime(fd['maturity_date'], "%Y-%m-%d %H:%M:%S")
-    if datetime.now() < maturity_date:
+    if time.time() < fd['maturity_ts']:
         return False, "Fixed deposit has not matured yet"
 
     # Credit amount to account
-    st.session_state.accounts[username]['balance'] += fd['maturity_amount']
-    record_transaction(username, 'Fixed Deposit Maturity', fd['maturity_amount'], description=f"FD ID: {fd_id}")
-
-    # Update FD status
-    fd['status'] = 'closed'
-    fd['closed_date'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-    save_data()
+    with db_transaction():
+        st.session_state.accounts[username]['balance'] += fd['maturity_amount']
+        save_balance(username)
+        record_transaction(username, 'Fixed Deposit Maturity', fd['maturity_amount'], description=f"FD ID: {fd_id}")
+
+        # Update FD status
+        fd['status'] = 'closed'
+        fd['closed_date'] = datetime.now().strftime(TS_FMT)
+        save_fixed_deposit(username, fd_id)
     return True, f"Fixed deposit {fd_id} closed. ${fd['maturity_amount']} credited to your account"
 
 
 # UI Components
+@st.cache_data
+def asset_css(name):
+    # Read once per process; the cached string is reused on every rerun
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", name)
+    with open(path, "r") as f:
+        return "<style>" + f.read() + "</style>"
+
 def login_section():
-    st.markdown("""
-        <style>
-            .login-container {
-                max-width: 500px;
-                margin: 0 auto;
-                padding: 2rem;
-                border-radius: 10px;
-                box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-                background-color: #ffffff;
-            }
-            .bank-header {
-                text-align: center;
-                margin-bottom: 2rem;
-                color: #2c3e50;
-            }
-            .bank-logo {
-                font-size: 2.5rem;
-                margin-bottom: 0.5rem;
-            }
-            .bank-subtitle {
-                color: #7f8c8d;
-                margin-bottom: 2rem;
-            }
-            .stButton>button {
-                width: 100%;
-                border-radius: 5px;
-                padding: 0.5rem;
-                font-weight: 500;
-                background-color: #3498db;
-                border: none;
-                transition: all 0.3s ease;
-            }
-            .stButton>button:hover {
-                background-color: #2980b9;
-                transform: translateY(-2px);
-            }
-            .stTextInput>div>div>input {
-                border-radius: 5px;
-                padding: 0.5rem;
-            }
-            .stNumberInput>div>div>input {
-                border-radius: 5px;
-                padding: 0.5rem;
-            }
-            .stSelectbox>div>div>div {
-                border-radius: 5px;
-                padding: 0.5rem;
-            }
-            .tab-content {
-                padding: 1rem 0;
-            }
-            .success-message {
-                background-color: #d4edda;
-                color: #155724;
-                padding: 1rem;
-                border-radius: 5px;
-                margin-bottom: 1rem;
-            }
-            .error-message {
-                background-color: #f8d7da;
-                color: #721c24;
-                padding: 1rem;
-                border-radius: 5px;
-                margin-bottom: 1rem;
-            }
-            .password-hint {
-                font-size: 0.8rem;
-                color: #7f8c8d;
-                margin-top: -1rem;
-                margin-bottom: 1rem;
-            }
-        </style>
-    """, unsafe_allow_html=True)
+    st.markdown(asset_css("login.css"), unsafe_allow_html=True)
 
     st.markdown("""
         <div class="login-container">
@@ -542,147 +1000,7 @@ def dashboard():
     if check_session_timeout():
         st.rerun()
 
-    st.markdown("""
-        <style>
-            .dashboard-header {
-                display: flex;
-                justify-content: space-between;
-                align-items: center;
-                margin-bottom: 2rem;
-            }
-            .account-card {
-                background: linear-gradient(135deg, #3498db, #2c3e50);
-                color: white;
-                border-radius: 10px;
-                padding: 1.5rem;
-                box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-                margin-bottom: 1rem;
-            }
-            .account-card h3 {
-                margin-top: 0;
-                color: white;
-            }
-            .metric-card {
-                background-color: #f8f9fa;
-                border-radius: 10px;
-                padding: 1rem;
-                box-shadow: 0 2px 4px rgba(0, 0, 0, 0.05);
-                margin-bottom: 1rem;
-            }
-            .metric-card h4 {
-                margin-top: 0;
-                color: #7f8c8d;
-                font-size: 0.9rem;
-            }
-            .metric-value {
-                font-size: 1.5rem;
-                font-weight: bold;
-                color: #2c3e50;
-            }
-            .operation-card {
-                background-color: white;
-                border-radius: 10px;
-                padding: 1.5rem;
-                box-shadow: 0 2px 4px rgba(0, 0, 0, 0.05);
-                margin-bottom: 2rem;
-            }
-            .transaction-row {
-                display: flex;
-                justify-content: space-between;
-                padding: 0.75rem 0;
-                border-bottom: 1px solid #eee;
-            }
-            .transaction-row:last-child {
-                border-bottom: none;
-            }
-            .transaction-type {
-                font-weight: 500;
-            }
-            .transaction-amount.positive {
-                color: #27ae60;
-            }
-            .transaction-amount.negative {
-                color: #e74c3c;
-            }
-            .loan-card {
-                background-color: #f8f9fa;
-                border-radius: 10px;
-                padding: 1rem;
-                margin-bottom: 1rem;
-            }
-            .loan-status {
-                display: inline-block;
-                padding: 0.25rem 0.5rem;
-                border-radius: 20px;
-                font-size: 0.8rem;
-                font-weight: 500;
-            }
-            .status-active {
-                background-color: #d4edda;
-                color: #155724;
-            }
-            .status-paid {
-                background-color: #cce5ff;
-                color: #004085;
-            }
-            .fd-card {
-                background-color: #f8f9fa;
-                border-radius: 10px;
-                padding: 1rem;
-                margin-bottom: 1rem;
-            }
-            .progress-container {
-                height: 8px;
-                background-color: #ecf0f1;
-                border-radius: 4px;
-                margin: 0.5rem 0;
-            }
-            .progress-bar {
-                height: 100%;
-                border-radius: 4px;
-                background-color: #3498db;
-            }
-            .logout-btn {
-                position: fixed;
-                bottom: 20px;
-                right: 20px;
-            }
-            .stRadio>div {
-                display: flex;
-                gap: 1rem;
-            }
-            .stRadio>div>label {
-                flex: 1;
-                text-align: center;
-                padding: 0.5rem;
-                border-radius: 5px;
-                border: 1px solid #ddd;
-                cursor: pointer;
-                transition: all 0.3s ease;
-            }
-            .stRadio>div>label:hover {
-                background-color: #f8f9fa;
-            }
-            .stRadio>div>label[data-baseweb="radio"]>div:first-child {
-                display: none;
-            }
-            .stRadio>div>label[data-baseweb="radio"]>div:last-child {
-                width: 100%;
-            }
-            .stRadio>div>label[aria-checked="true"] {
-                background-color: #3498db;
-                color: white;
-                border-color: #3498db;
-            }
-            .st-expander>div>div {
-                border-radius: 10px;
-                border: 1px solid #eee;
-            }
-            .st-expander>div>div:hover {
-                border-color: #3498db;
-            }
-        </style>
-    """, unsafe_allow_html=True)
+    st.markdown(asset_css("dashboard.css"), unsafe_allow_html=True)
 
     st.markdown(f"""
         <div class="dashboard-header">
@@ -695,53 +1013,23 @@ def dashboard():
     if st.session_state.current_user in st.session_state.accounts:
         account = st.session_state.accounts[st.session_state.current_user]
 
-        # Account summary
-        st.markdown(f"""
-            <div class="account-card">
-                <h3>Account Overview</h3>
-                <div style="font-size: 2.5rem; font-weight: bold;">${account.get('balance', 0):,.2f}</div>
-                <div style="margin-top: 1rem;">
-                    <span style="color: #bdc3c7;">Account ID:</span> {account.get('account_id', 'N/A')}
-                </div>
-            </div>
-        """, unsafe_allow_html=True)
+        # Account summary - native widgets render client-side and skip the
+        # per-rerun HTML sanitizer
+        with st.container(border=True):
+            st.subheader("Account Overview")
+            st.metric("Balance", f"${account.get('balance', 0):,.2f}")
+            st.caption(f"Account ID: {account.get('account_id', 'N/A')}")
 
         # Quick actions
         col1, col2, col3 = st.columns(3)
-        with col1:
-            st.markdown(f"""
-                <div class="metric-card">
-                    <h4>Account Type</h4>
-                    <div class="metric-value">{account.get('account_type', 'Standard').title()}</div>
-                </div>
-            """, unsafe_allow_html=True)
-        with col2:
-            st.markdown(f"""
-                <div class="metric-card">
-                    <h4>Account Created</h4>
-                    <div class="metric-value">{account.get('created', 'N/A')}</div>
-                </div>
-            """, unsafe_allow_html=True)
-        with col3:
-            st.markdown(f"""
-                <div class="metric-card">
-                    <h4>Account Status</h4>
-                    <div class="metric-value">{account.get('status', 'Active').title()}</div>
-                </div>
-            """, unsafe_allow_html=True)
+        col1.metric("Account Type", account.get('account_type', 'Standard').title())
+        col2.metric("Account Created", account.get('created', 'N/A'))
+        col3.metric("Account Status", account.get('status', 'Active').title())
     else:
         st.error("Account information not found")
         return
 
     # Operations
-    st.markdown("""
-        <style>
-            .operation-tabs {
-                margin: 2rem 0;
-            }
-        </style>
-    """, unsafe_allow_html=True)
-
     operation = st.radio(
         "Select Operation",
         ["Deposit", "Withdraw", "Transfer", "Transaction History", "Loans", "Fixed Deposits"],
@@ -816,6 +1104,16 @@ def dashboard():
                             st.error(result)
             else:
                 st.subheader("Confirm Transfer")
+                # One markdown element for the whole panel instead of
+                # open/optional/close fragments
+                transfer_details = st.session_state.transfer_data[st.session_state.transfer_id]
+                description_row = ""
+                if transfer_details.get('description'):
+                    description_row = f"""
+                        <div style="display: flex; justify-content: space-between;">
+                            <div style="font-weight: 500;">Description:</div>
+                            <div>{transfer_details['description']}</div>
+                        </div>"""
                 st.markdown(f"""
                     <div style="background-color: #f8f9fa; padding: 1.5rem; border-radius: 10px; margin-bottom: 1.5rem;">
                         <div style="display: flex; justify-content: space-between; margin-bottom: 1rem;">
@@ -825,20 +1123,10 @@ def dashboard():
                         <div style="display: flex; justify-content: space-between; margin-bottom: 1rem;">
                             <div style="font-weight: 500;">Amount:</div>
                             <div style="font-weight: bold; font-size: 1.2rem;">${st.session_state.transfer_amount:,.2f}</div>
-                        </div>
+                        </div>{description_row}
+                    </div>
                 """, unsafe_allow_html=True)
 
-                transfer_details = st.session_state.transfer_data[st.session_state.transfer_id]
-                if transfer_details.get('description'):
-                    st.markdown(f"""
-                        <div style="display: flex; justify-content: space-between;">
-                            <div style="font-weight: 500;">Description:</div>
-                            <div>{transfer_details['description']}</div>
-                        </div>
-                    """, unsafe_allow_html=True)
-
-                st.markdown('</div>', unsafe_allow_html=True)
-
                 col1, col2 = st.columns(2)
                 with col1:
                     if st.button("Confirm Transfer", type="primary"):
@@ -855,126 +1143,90 @@ def dashboard():
                         st.rerun()
             st.markdown('</div>', unsafe_allow_html=True)
     elif operation == "Transaction History":
-        with st.container():
-            st.subheader("Transaction History")
-        
-        # CSS styling in markdown
-        st.markdown("""
-        <style>
-            .transaction-container {
-                margin-top: 1rem;
-            }
-            .transaction-row {
-                display: flex;
-                justify-content: space-between;
-                padding: 0.75rem 0;
-                border-bottom: 1px solid #eee;
-            }
-            .transaction-row:last-child {
-                border-bottom: none;
-            }
-            .transaction-type {
-                font-weight: 500;
-            }
-            .transaction-details {
-                font-size: 0.8rem;
-                color: #7f8c8d;
-            }
-            .transaction-description {
-                font-size: 0.8rem;
-                margin-top: 0.25rem;
-            }
-            .transaction-amount {
-                font-weight: bold;
-                font-size: 1.1rem;
-            }
-            .positive {
-                color: #27ae60;
-            }
-            .negative {
-                color: #e74c3c;
-            }
-        </style>
-        """, unsafe_allow_html=True)
-
-        if st.session_state.current_user not in st.session_state.transactions:
+        st.subheader("Transaction History")
+
+        df = user_transactions_df(st.session_state.current_user, tx_cache_key())
+        if df.empty:
             st.write("No transactions yet.")
         else:
-            user_transactions = [
-                {**tx, 'id': tx_id}
-                for tx_id, tx in st.session_state.transactions[st.session_state.current_user].items()
-            ]
-
-            if not user_transactions:
-                st.write("No transactions yet.")
+            # Filter options
+            col1, col2 = st.columns(2)
+            with col1:
+                transaction_type = st.selectbox(
+                    "Filter by type",
+                    ["All"] + list(df['type'].unique()),
+                    index=0
+                )
+            with col2:
+                date_range = st.selectbox(
+                    "Filter by date range",
+                    ["All time", "Last 7 days", "Last 30 days", "Last 90 days"],
+                    index=0
+                )
+
+            # Apply filters as one query so active conjuncts share a
+            # single mask and copy instead of one per filter
+            clauses = []
+            if transaction_type != "All":
+                clauses.append("type == @transaction_type")
+            if date_range != "All time":
+                days = 7 if date_range == "Last 7 days" else 30 if date_range == "Last 30 days" else 90
+                cutoff_date = datetime.now() - timedelta(days=days)
+                clauses.append("timestamp_dt >= @cutoff_date")
+            if clauses:
+                df = df.query(" and ".join(clauses))
+
+            # Display transactions
+            if df.empty:
+                st.write("No transactions match your filters.")
             else:
-                df = pd.DataFrame(user_transactions)
-                df = df.sort_values('timestamp', ascending=False)
-
-                # Filter options
-                col1, col2 = st.columns(2)
+                # Show summary statistics; observed=True skips category
+                # levels the filters removed
+                sums = df.groupby('type', sort=False, observed=True)['amount'].sum()
+                col1, col2, col3 = st.columns(3)
                 with col1:
-                    transaction_type = st.selectbox(
-                        "Filter by type",
-                        ["All"] + list(df['type'].unique()),
-                        index=0
-                    )
+                    st.metric("Total Transactions", len(df))
                 with col2:
-                    date_range = st.selectbox(
-                        "Filter by date range",
-                        ["All time", "Last 7 days", "Last 30 days", "Last 90 days"],
-                        index=0
-                    )
-
-                # Apply filters
-                if transaction_type != "All":
-                    df = df[df['type'] == transaction_type]
-
-                if date_range != "All time":
-                    days = 7 if date_range == "Last 7 days" else 30 if date_range == "Last 30 days" else 90
-                    cutoff_date = datetime.now() - timedelta(days=days)
-                    df['timestamp_dt'] = pd.to_datetime(df['timestamp'])
-                    df = df[df['timestamp_dt'] >= cutoff_date]
-
-                # Display transactions
-                if df.empty:
-                    st.write("No transactions match your filters.")
+                    st.metric("Total Deposits", f"${sums.get('Deposit', 0):,.2f}")
+                with col3:
+                    st.metric("Total Withdrawals", f"${sums.get('Withdrawal', 0):,.2f}")
+
+                # Paginate so table work is bounded by the page size,
+                # not the full history; the chart keeps the full frame
+                num_pages = (len(df) + HISTORY_PAGE_SIZE - 1) // HISTORY_PAGE_SIZE
+                if num_pages > 1:
+                    page = st.number_input("Page", 1, num_pages, 1)
                 else:
-                    # Show summary statistics
-                    col1, col2, col3 = st.columns(3)
-                    with col1:
-                        st.metric("Total Transactions", len(df))
-                    with col2:
-                        st.metric("Total Deposits", f"${df[df['type'] == 'Deposit']['amount'].sum():,.2f}")
-                    with col3:
-                        st.metric("Total Withdrawals", f"${df[df['type'] == 'Withdrawal']['amount'].sum():,.2f}")
-
-                    # Show transaction list using Streamlit components
-                    for _, row in df.iterrows():
-                        amount_class = "positive" if row['type'] in ['Deposit', 'Transfer In'] else "negative"
-                        
-                        # Create columns for the transaction row
-                        col1, col2 = st.columns([3, 1])
-                        with col1:
-                            st.markdown(f"**{row['type']}**")
-                            st.caption(row['timestamp'])
-                            if row['description']:
-                                st.caption(row['description'])
-                        with col2:
-                            st.markdown(f"<div class='transaction-amount {amount_class}'>${row['amount']:,.2f}</div>", 
-                                       unsafe_allow_html=True)
-                        
-                        # Add divider between transactions
-                        st.divider()
-
-                    # Show transaction trend chart
-                    st.subheader("Transaction Trend")
-                    df_chart = df.copy()
-                    df_chart['date'] = pd.to_datetime(df_chart['timestamp']).dt.date
-                    df_chart = df_chart.groupby(['date', 'type'])['amount'].sum().unstack().fillna(0)
-
-                    fig = px.line(df_chart, title="Daily Transaction Amounts")
-                    st.plotly_chart(fig)
+                    page = 1
+                df_page = df.iloc[(page - 1) * HISTORY_PAGE_SIZE:page * HISTORY_PAGE_SIZE]
+
+                # Show transaction list as one dataframe widget instead
+                # of per-row markdown/columns/divider
+                is_credit = df_page['type'].isin(['Deposit', 'Transfer In'])
+                df_view = df_page[['type', 'timestamp', 'description', 'amount']].copy()
+                df_view['description'] = df_view['description'].fillna('')
+                df_view['amount'] = df_view['amount'].map('${:,.2f}'.format)
+                styled = df_view.style.apply(
+                    lambda _: ['color: #27ae60' if credit else 'color: #e74c3c'
+                               for credit in is_credit],
+                    subset=['amount'])
+                st.dataframe(
+                    styled,
+                    use_container_width=True,
+                    hide_index=True,
+                    column_config={
+                        'type': 'Type',
+                        'timestamp': 'Date',
+                        'description': 'Description',
+                        'amount': 'Amount'
+                    })
+
+                # Show transaction trend chart
+                st.subheader("Transaction Trend")
+                fig = build_trend_fig(
+                    st.session_state.current_user, tx_cache_key(),
+                    transaction_type, date_range, df)
+                st.plotly_chart(fig, use_container_width=True)
 
     elif operation == "Loans":
         with st.container():
@@ -999,73 +1251,59 @@ def dashboard():
 
             with loan_tab2:
                 st.subheader("My Loans")
-                if st.session_state.current_user not in st.session_state.loans or not st.session_state.loans[st.session_state.current_user]:
+                user_loans = st.session_state.loans.get(st.session_state.current_user)
+                if not user_loans:
                     st.write("You don't have any loans.")
                 else:
-                    for loan_id, loan in st.session_state.loans[st.session_state.current_user].items():
-                        status_class = "status-active" if loan['status'] == 'active' else "status-paid"
-                        with st.expander(f"Loan {loan_id} - {loan['status'].title()}"):
-                            st.markdown(f"""
-                                <div class="loan-card">
-                                    <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 1rem;">
-                                        <div>
-                                            <span class="loan-status {status_class}">{loan['status'].title()}</span>
-                                        </div>
-                                        <div style="font-size: 1.2rem; font-weight: bold;">${loan['remaining_balance']:,.2f}</div>
-                                    </div>
-                                    <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 1rem; margin-bottom: 1rem;">
-                                        <div>
-                                            <div style="font-size: 0.8rem; color: #7f8c8d;">Original Amount</div>
-                                            <div style="font-weight: 500;">${loan['amount']:,.2f}</div>
-                                        </div>
-                                        <div>
-                                            <div style="font-size: 0.8rem; color: #7f8c8d;">Duration</div>
-                                            <div style="font-weight: 500;">{loan['duration_months']} months</div>
-                                        </div>
-                                        <div>
-                                            <div style="font-size: 0.8rem; color: #7f8c8d;">Interest Rate</div>
-                                            <div style="font-weight: 500;">{loan['interest_rate']*100}%</div>
-                                        </div>
-                                        <div>
-                                            <div style="font-size: 0.8rem; color: #7f8c8d;">Monthly Payment</div>
-                                            <div style="font-weight: 500;">${loan['monthly_payment']:,.2f}</div>
-                                        </div>
-                                    </div>
-                                    <div style="margin-bottom: 1rem;">
-                                        <div style="display: flex; justify-content: space-between; font-size: 0.8rem;">
-                                            <div>Progress</div>
-                                            <div>{loan['payments_made']}/{loan['duration_months']} payments</div>
-                                        </div>
-                                        <div class="progress-container">
-                                            <div class="progress-bar" style="width: {loan['payments_made']/loan['duration_months']*100}%"></div>
-                                        </div>
-                                    </div>
-                            """, unsafe_allow_html=True)
-
-                            if loan['status'] == 'active':
-                                with st.form(f"loan_payment_{loan_id}"):
-                                    payment_amount = st.number_input(
-                                        "Payment Amount",
-                                        min_value=loan['monthly_payment'],
-                                        value=loan['monthly_payment'],
-                                        step=10,
-                                        key=f"payment_{loan_id}"
-                                    )
-                                    submit_payment = st.form_submit_button(
-                                        "Make Payment", type="primary"
-                                    )
-                                    if submit_payment:
-                                        success, message = make_loan_payment(
-                                            st.session_state.current_user,
-                                            loan_id,
-                                            payment_amount
-                                        )
-                                        if success:
-                                            st.success(message)
-                                            st.rerun()
-                                        else:
-                                            st.error(message)
-                            st.markdown('</div>', unsafe_allow_html=True)
+                    # One summary table plus a detail selector: widget
+                    # count stays constant however many loans exist
+                    summary = pd.DataFrame([
+                        {'Loan ID': loan_id,
+                         'Status': loan['status'].title(),
+                         'Amount': loan['amount'],
+                         'Remaining': loan['remaining_balance'],
+                         'Monthly Payment': loan['monthly_payment'],
+                         'Progress': f"{loan['payments_made']}/{loan['duration_months']}"}
+                        for loan_id, loan in user_loans.items()])
+                    st.dataframe(
+                        summary.style.format({'Amount': '${:,.2f}',
+                                              'Remaining': '${:,.2f}',
+                                              'Monthly Payment': '${:,.2f}'}),
+                        use_container_width=True,
+                        hide_index=True)
+
+                    loan_id = st.selectbox("Loan details", list(user_loans))
+                    loan = user_loans[loan_id]
+                    # Records loaded from disk fill the cache on first
+                    # render; writes keep it fresh
+                    if '_html_cache' not in loan:
+                        loan['_html_cache'] = loan_card_html(loan)
+                    st.markdown(loan['_html_cache'], unsafe_allow_html=True)
+
+                    if loan['status'] == 'active':
+                        with st.form(f"loan_payment_{loan_id}"):
+                            payment_amount = st.number_input(
+                                "Payment Amount",
+                                min_value=loan['monthly_payment'],
+                                value=loan['monthly_payment'],
+                                step=10,
+                                key=f"payment_{loan_id}"
+                            )
+                            submit_payment = st.form_submit_button(
+                                "Make Payment", type="primary"
+                            )
+                            if submit_payment:
+                                success, message = make_loan_payment(
+                                    st.session_state.current_user,
+                                    loan_id,
+                                    payment_amount
+                                )
+                                if success:
+                                    st.success(message)
+                                    st.rerun()
+                                else:
+                                    st.error(message)
+                    st.markdown('</div>', unsafe_allow_html=True)
             st.markdown('</div>', unsafe_allow_html=True)
 
     elif operation == "Fixed Deposits":
@@ -1091,84 +1329,53 @@ def dashboard():
 
             with fd_tab2:
                 st.subheader("My Fixed Deposits")
-                if st.session_state.current_user not in st.session_state.fixed_deposits or not st.session_state.fixed_deposits[st.session_state.current_user]:
+                user_fds = st.session_state.fixed_deposits.get(st.session_state.current_user)
+                if not user_fds:
                     st.write("You don't have any fixed deposits.")
                 else:
-                    for fd_id, fd in st.session_state.fixed_deposits[st.session_state.current_user].items():
-                        with st.expander(f"FD {fd_id} - {fd['status'].title()}"):
-                            st.markdown(f"""
-                                <div class="fd-card">
-                                    <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 1rem; margin-bottom: 1rem;">
-                                        <div>
-                                            <div style="font-size: 0.8rem; color: #7f8c8d;">Principal</div>
-                                            <div style="font-weight: 500;">${fd['principal']:,.2f}</div>
-                                        </div>
-                                        <div>
-                                            <div style="font-size: 0.8rem; color: #7f8c8d;">Duration</div>
-                                            <div style="font-weight: 500;">{fd['duration_months']} months</div>
-                                        </div>
-                                        <div>
-                                            <div style="font-size: 0.8rem; color: #7f8c8d;">Interest Rate</div>
-                                            <div style="font-weight: 500;">{fd['interest_rate']*100}%</div>
-                                        </div>
-                                        <div>
-                                            <div style="font-size: 0.8rem; color: #7f8c8d;">Maturity Amount</div>
-                                            <div style="font-weight: 500;">${fd['maturity_amount']:,.2f}</div>
-                                        </div>
-                                    </div>
-                                    <div style="margin-bottom: 1rem;">
-                                        <div style="font-size: 0.8rem; color: #7f8c8d;">Start Date</div>
-                                        <div style="font-weight: 500;">{fd['start_date']}</div>
-                                    </div>
-                                    <div style="margin-bottom: 1rem;">
-                                        <div style="font-size: 0.8rem; color: #7f8c8d;">Maturity Date</div>
-                                        <div style="font-weight: 500;">{fd['maturity_date']}</div>
-                                    </div>
-                            """, unsafe_allow_html=True)
-
-                            if fd['status'] == 'active':
-                                maturity_date = datetime.strptime(fd['maturity_date'], "%Y-%m-%d %H:%M:%S")
-                                if datetime.now() >= maturity_date:
-                                    if st.button("Close Fixed Deposit", key=f"close_{fd_id}"):
-                                        success, message = close_fixed_deposit(
-                                            st.session_state.current_user, fd_id)
-                                        if success:
-                                            st.success(message)
-                                            st.rerun()
-                                        else:
-                                            st.error(message)
+                    now_ts = time.time()  # one clock read for the whole tab
+                    summary = pd.DataFrame([
+                        {'FD ID': fd_id,
+                         'Status': fd['status'].title(),
+                         'Principal': fd['principal'],
+                         'Maturity Amount': fd['maturity_amount'],
+                         'Maturity Date': fd['maturity_date']}
+                        for fd_id, fd in user_fds.items()])
+                    st.dataframe(
+                        summary.style.format({'Principal': '${:,.2f}',
+                                              'Maturity Amount': '${:,.2f}'}),
+                        use_container_width=True,
+                        hide_index=True)
+
+                    fd_id = st.selectbox("Fixed deposit details", list(user_fds))
+                    fd = user_fds[fd_id]
+                    if '_html_cache' not in fd:
+                        fd['_html_cache'] = fd_card_html(fd)
+                    st.markdown(fd['_html_cache'], unsafe_allow_html=True)
+
+                    if fd['status'] == 'active':
+                        if now_ts >= fd['maturity_ts']:
+                            if st.button("Close Fixed Deposit", key=f"close_{fd_id}"):
+                                success, message = close_fixed_deposit(
+                                    st.session_state.current_user, fd_id)
+                                if success:
+                                    st.success(message)
+                                    st.rerun()
                                 else:
-                                    days_remaining = (maturity_date - datetime.now()).days
-                                    st.markdown(f"""
-                                        <div style="margin-top: 1rem;">
-                                            <div style="font-size: 0.8rem; color: #7f8c8d;">Days to Maturity</div>
-                                            <div style="font-weight: 500;">{days_remaining} days</div>
-                                        </div>
-                                    """, unsafe_allow_html=True)
-                            st.markdown('</div>', unsafe_allow_html=True)
+                                    st.error(message)
+                        else:
+                            days_remaining = int(fd['maturity_ts'] - now_ts) // 86400
+                            st.markdown(FD_DAYS_REMAINING_TMPL.substitute(
+                                days_remaining=days_remaining), unsafe_allow_html=True)
+                    st.markdown('</div>', unsafe_allow_html=True)
             st.markdown('</div>', unsafe_allow_html=True)
 
-    # Logout button
-    st.markdown("""
-        <div class="logout-btn">
-            <style>
-                .logout-btn button {
-                    border-radius: 20px;
-                    padding: 0.5rem 1rem;
-                    background-color: #e74c3c;
-                    color: white;
-                    border: none;
-                    transition: all 0.3s ease;
-                }
-                .logout-btn button:hover {
-                    background-color: #c0392b;
-                    transform: translateY(-2px);
-                }
-            </style>
-    """, unsafe_allow_html=True)
+    # Logout button (styled from dashboard.css)
+    st.markdown('<div class="logout-btn">', unsafe_allow_html=True)
     if st.button("Logout"):
         st.session_state.authenticated = False
         st.session_state.current_user = None
+        st.session_state.session_expiry = None
         st.session_state.transfer_confirmation = False
         st.rerun()
     st.markdown("</div>", unsafe_allow_html=True)
@@ -1178,8 +1385,11 @@ def main():
     # Initialize session state
     init_session_state()
 
-    # Load data at startup
-    load_data()
+    # Load data once per session; writes go through the save_* helpers,
+    # so reruns never need to re-read the database
+    if not st.session_state.get('data_loaded'):
+        load_data()
+        st.session_state.data_loaded = True
 
     # Set page config
     st.set_page_config(
@@ -1189,72 +1399,10 @@ def main():
         initial_sidebar_state="collapsed"
     )
 
-    # Add custom CSS
-    st.markdown("""
-        <style>
-            /* Main content styling */
-            .stApp {
-                background-color: #f5f7fa;
-            }
-            /* Input field focus styling */
-            .stTextInput>div>div>input:focus, 
-            .stNumberInput>div>div>input:focus, 
-            .stSelectbox>div>div>select:focus {
-                border-color: #3498db !important;
-                box-shadow: 0 0 0 2px rgba(52, 152, 219, 0.2) !important;
-            }
-            /* Button hover effects */
-            .stButton>button:hover {
-                transform: translateY(-2px);
-                box-shadow: 0 4px 8px rgba(0, 0, 0, 0.1);
-            }
-            /* Tab styling */
-            [data-baseweb="tab-list"] {
-                gap: 1rem;
-            }
-            [data-baseweb="tab"] {
-                padding: 0.5rem 1rem;
-                border-radius: 5px;
-                transition: all 0.3s ease;
-            }
-            [data-baseweb="tab"]:hover {
-                background-color: #f8f9fa;
-            }
-            [aria-selected="true"] {
-                background-color: #3498db !important;
-                color: white !important;
-            }
-            /* Metric cards */
-            [data-testid="stMetric"] {
-                border: 1px solid #eee;
-                border-radius: 10px;
-                padding: 1rem;
-                transition: all 0.3s ease;
-            }
-            [data-testid="stMetric"]:hover {
-                border-color: #3498db;
-                box-shadow: 0 4px 6px rgba(0, 0, 0, 0.05);
-            }
-            /* Expander styling */
-            .st-expander {
-                border: 1px solid #eee;
-                border-radius: 10px;
-                padding: 1rem;
-            }
-            .st-expander:hover {
-                border-color: #3498db;
-            }
-            /* Dataframe styling */
-            .stDataFrame {
-                border-radius: 10px;
-                overflow: hidden;
-            }
-            /* Remove Streamlit branding */
-            #MainMenu {visibility: hidden;}
-            footer {visibility: hidden;}
-            header {visibility: hidden;}
-        </style>
-    """, unsafe_allow_html=True)
+    # Global CSS: the string is built/read once via the cached asset
+    # helper, but must be re-emitted every run - Streamlit drops
+    # elements that a rerun does not re-send
+    st.markdown(asset_css("global.css"), unsafe_allow_html=True)
 
     # Show appropriate section based on auth status
     if st.session_state.authenticated: